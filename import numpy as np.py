@@ -1,5 +1,13 @@
+import math
+from collections import namedtuple
 import numpy as np
 
+from opendrift.phyt_growth import (_all_scalar, _kernel_inputs, _nan_min,
+                                   _numba_kernel)
+
+GrowthResult = namedtuple(
+    'GrowthResult', ['dPdt', 'mu', 'mu_nut', 'lim_N', 'lim_P', 'lim_Fe'])
+
 def phyto_growth_multinutrient(
     P,
     I,
@@ -22,22 +30,65 @@ def phyto_growth_multinutrient(
 
     Parameters
     ----------
-    P : float
+    P : float or array-like
         Phytoplankton concentration
-    I : float
+    I : float or array-like
         Light (µE m^-2 s^-1)
-    N, Pnut, Fe : float
+    N, Pnut, Fe : float or array-like
         Nutrient concentrations (mmol m^-3)
-    T : float
+    T : float or array-like
         Temperature (°C)
     K_N, K_P, K_Fe : float
         Half-saturation constants
+
+    Returns
+    -------
+    GrowthResult
+        Named tuple (dPdt, mu, mu_nut, lim_N, lim_P, lim_Fe).
+
+    Array inputs (e.g. one value per particle) are broadcast against
+    each other, so growth of all elements is computed in one call,
+    using a compiled kernel if numba is installed and all inputs are
+    float64 arrays of the same shape. Scalar inputs are
+    evaluated with the math module instead of NumPy.
     """
 
+    # Q10 ** ((T - T_ref)/10), written as an exponential
+    kT = (math.log(Q10) if np.ndim(Q10) == 0 else np.log(Q10)) * 0.1
+
+    params = (mu_max, alpha, K_N, K_P, K_Fe, Q10, T_ref, mortality)
+    if _all_scalar(P, I, N, Pnut, Fe, T, *params):
+        mu_I = -math.expm1(-alpha * I)
+        lim_N = N / (K_N + N)
+        lim_P = Pnut / (K_P + Pnut)
+        lim_Fe = Fe / (K_Fe + Fe)
+        mu_nut = _nan_min(lim_N, lim_P, lim_Fe)
+        mu = mu_max * mu_I * mu_nut * math.exp(kT * (T - T_ref))
+        return GrowthResult((mu - mortality) * P, mu, mu_nut,
+                            lim_N, lim_P, lim_Fe)
+
+    # The compiled kernel takes arrays of inputs, but scalar parameters
+    inputs = _kernel_inputs(P, I, N, Pnut, Fe, T)
+    kernel = (_numba_kernel('phyto_growth_multinutrient_core')
+              if inputs is not None and not any(np.ndim(p) for p in params)
+              else None)
+    if kernel is not None:
+        shape, arrays = inputs
+        results = kernel(
+            *arrays, mu_max, alpha, K_N, K_P, K_Fe, kT, T_ref, mortality)
+        return GrowthResult(*(r.reshape(shape) for r in results))
+
+    P = np.asarray(P)
+    I = np.asarray(I)
+    N = np.asarray(N)
+    Pnut = np.asarray(Pnut)
+    Fe = np.asarray(Fe)
+    T = np.asarray(T)
+
     # --------------------
     # Light limitation
     # --------------------
-    mu_I = 1.0 - np.exp(-alpha * I)
+    mu_I = -np.expm1(-alpha * I)
 
     # --------------------
     # Multi-nutrient limitation (Liebig minimum)
@@ -46,12 +97,12 @@ def phyto_growth_multinutrient(
     lim_P  = Pnut / (K_P  + Pnut)
     lim_Fe = Fe  / (K_Fe + Fe)
 
-    mu_nut = min(lim_N, lim_P, lim_Fe)
+    mu_nut = np.minimum(np.minimum(lim_N, lim_P), lim_Fe)
 
     # --------------------
     # Temperature dependence
     # --------------------
-    mu_T = Q10 ** ((T - T_ref) / 10.0)
+    mu_T = np.exp(kT * (T - T_ref))
 
     # --------------------
     # Combined specific growth rate
@@ -61,25 +112,26 @@ def phyto_growth_multinutrient(
     # dP/dt including mortality
     dPdt = (mu - mortality) * P
 
-    return dPdt, mu, mu_nut, lim_N, lim_P, lim_Fe
+    return GrowthResult(dPdt, mu, mu_nut, lim_N, lim_P, lim_Fe)
 
 
 # ---------------------------------------------------------
 # Example usage
-P0   = 1.0
-I    = 80
-N    = 1.2
-Pnut = 0.05
-Fe   = 0.002
-T    = 18
-
-results = phyto_growth_multinutrient(P0, I, N, Pnut, Fe, T)
-
-(dPdt, mu, mu_nut, lim_N, lim_P, lim_Fe) = results
-
-print("Specific growth rate (1/day):", mu)
-print("dP/dt:", dPdt)
-print("N limitation:", lim_N)
-print("P limitation:", lim_P)
-print("Fe limitation:", lim_Fe)
-print("Overall nutrient limitation:", mu_nut)
+if __name__ == '__main__':
+    P0   = 1.0
+    I    = 80
+    N    = 1.2
+    Pnut = 0.05
+    Fe   = 0.002
+    T    = 18
+
+    results = phyto_growth_multinutrient(P0, I, N, Pnut, Fe, T)
+
+    (dPdt, mu, mu_nut, lim_N, lim_P, lim_Fe) = results
+
+    print("Specific growth rate (1/day):", mu)
+    print("dP/dt:", dPdt)
+    print("N limitation:", lim_N)
+    print("P limitation:", lim_P)
+    print("Fe limitation:", lim_Fe)
+    print("Overall nutrient limitation:", mu_nut)
@@ -0,0 +1,71 @@
+"""
+Numba-compiled kernels for the phytoplankton growth functions.
+
+This module can only be imported when numba is installed. The public
+functions in :mod:`opendrift.phyt_growth` fall back to their NumPy
+implementation otherwise, so nothing here should be called directly.
+
+The kernels take 1D float64 arrays (of any stride), and the temperature
+dependence as ``kT = log(Q10)/10``, so that ``mu_T = exp(kT*(T - T_ref))``.
+"""
+
+import math
+import numpy as np
+from numba import njit, prange
+
+# fastmath, except the assumption that there are no NaN or inf values,
+# so that missing input values give NaN growth as with NumPy
+_FASTMATH = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+
+@njit(fastmath=_FASTMATH, cache=True)
+def nan_min(a, b):
+    """Minimum of a and b, NaN if either is NaN (as np.minimum)."""
+    return a if a < b or a != a else b
+
+
+@njit(parallel=True, fastmath=_FASTMATH, cache=True)
+def phyt_growth_core(P, I, N, Ph, Fe, Si, T, mu_max, alpha, K_N, K_Ph, K_Fe,
+                     K_Si, kT, T_ref, mortality):
+    dPdt = np.empty(P.size)
+    for i in prange(P.size):
+        mu_I = -math.expm1(-alpha * I[i])
+
+        lim_N = N[i] / (K_N + N[i])
+        lim_Ph = Ph[i] / (K_Ph + Ph[i])
+        lim_Fe = Fe[i] / (K_Fe + Fe[i])
+        lim_Si = Si[i] / (K_Si + Si[i])
+        mu_nut = nan_min(nan_min(lim_N, lim_Ph), nan_min(lim_Fe, lim_Si))
+
+        mu_T = math.exp(kT * (T[i] - T_ref))
+
+        mu = mu_max * mu_I * mu_nut * mu_T
+        dPdt[i] = (mu - mortality) * P[i]
+
+    return dPdt
+
+
+@njit(parallel=True, fastmath=_FASTMATH, cache=True)
+def phyto_growth_multinutrient_core(P, I, N, Pnut, Fe, T, mu_max, alpha, K_N,
+                                    K_P, K_Fe, kT, T_ref, mortality):
+    n = P.size
+    dPdt = np.empty(n)
+    mu = np.empty(n)
+    mu_nut = np.empty(n)
+    lim_N = np.empty(n)
+    lim_P = np.empty(n)
+    lim_Fe = np.empty(n)
+    for i in prange(n):
+        mu_I = -math.expm1(-alpha * I[i])
+
+        lim_N[i] = N[i] / (K_N + N[i])
+        lim_P[i] = Pnut[i] / (K_P + Pnut[i])
+        lim_Fe[i] = Fe[i] / (K_Fe + Fe[i])
+        mu_nut[i] = nan_min(nan_min(lim_N[i], lim_P[i]), lim_Fe[i])
+
+        mu_T = math.exp(kT * (T[i] - T_ref))
+
+        mu[i] = mu_max * mu_I * mu_nut[i] * mu_T
+        dPdt[i] = (mu[i] - mortality) * P[i]
+
+    return dPdt, mu, mu_nut, lim_N, lim_P, lim_Fe
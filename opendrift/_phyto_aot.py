@@ -0,0 +1,50 @@
+"""
+Ahead-of-time compiled versions of the phytoplankton growth kernels.
+
+Numba's JIT compilation at first call can take longer than a short
+simulation itself. Running this module once::
+
+    python -m opendrift._phyto_aot
+
+compiles the kernels below into the C extension ``opendrift._phyto_ext``.
+If present, the extension is used by :func:`opendrift.phyt_growth.phyt_growth`
+and :meth:`opendrift.models.pelagicegg2.PelagicEggDrift.logistic_growth`,
+without any compilation at run time and without requiring numba. The
+extension is optional; otherwise the numba JIT or NumPy
+implementations are used.
+
+Arguments are as for :mod:`opendrift._numba`: 1D float64 arrays
+and ``kT = log(Q10)/10``. The logistic step is exported both for float32
+(``logistic_step_f4``, the dtype of ``PelagicEgg.egg_number``) and float64
+(``logistic_step_f8``) arrays.
+"""
+
+import os
+from numba.pycc import CC
+
+from opendrift import _numba
+
+cc = CC('_phyto_ext')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+# The same kernel body as the numba JIT version, so both compute the same
+phyt_growth = cc.export(
+    'phyt_growth', 'f8[:](f8[:], f8[:], f8[:], f8[:], f8[:], f8[:], f8[:], '
+    'f8, f8, f8, f8, f8, f8, f8, f8, f8)')(_numba.phyt_growth_core.py_func)
+
+
+def _logistic_step(N, r, K, dt):
+    """N += r*dt*N*(1 - N/K), in place"""
+    for i in range(N.size):
+        N[i] += r * dt * N[i] * (1.0 - N[i] / K)
+
+
+logistic_step_f4 = cc.export('logistic_step_f4',
+                             'void(f4[:], f8, f8, f8)')(_logistic_step)
+logistic_step_f8 = cc.export('logistic_step_f8',
+                             'void(f8[:], f8, f8, f8)')(_logistic_step)
+
+
+if __name__ == '__main__':
+    cc.compile()
@@ -1,3 +1,4 @@
+import math
 import numpy as np
 from datetime import datetime, timedelta
 
@@ -8,12 +9,22 @@ from datetime import datetime, timedelta
 def time_of_day_hours(time):
     """
     Convert a datetime object or timestamp to hours since midnight.
+
+    Arrays of datetimes (or numpy datetime64) are converted elementwise.
     """
     if isinstance(time, datetime):
         return time.hour + time.minute/60 + time.second/3600
-    else:
+
+    time = np.asarray(time)
+    if time.dtype == object:
+        time = time.astype('datetime64[s]')
+    if np.issubdtype(time.dtype, np.datetime64):
+        seconds = time.astype('datetime64[s]').astype(np.int64) % 86400
+        return seconds / 3600.
+    if time.ndim == 0:
         # If user supplies a float hour directly
         return float(time)
+    return time.astype(float)
 
 
 # --------------------------------------------------------
@@ -29,6 +40,7 @@ def idealized_surface_flux(time, daylength=24, Fmax=1000):
         Time of day. 
         If datetime → converted to hour-of-day automatically.
         If float → must be hours (0–24).
+        Arrays of either are evaluated elementwise.
     daylength : float
         Length of day in hours. Default: 24 (full sine cycle).
     Fmax : float
@@ -36,18 +48,125 @@ def idealized_surface_flux(time, daylength=24, Fmax=1000):
 
     Returns
     -------
-    float
+    float or array
         Surface downward shortwave flux (W/m²).
     """
-    t = time_of_day_hours(time)
+    return idealized_surface_flux_hours(time_of_day_hours(time),
+                                        daylength, Fmax)
 
-    phase = np.pi * t / daylength
-    flux = Fmax * np.maximum(0, np.sin(phase))  # zero at night
+
+def idealized_surface_flux_hours(t, daylength=24, Fmax=1000):
+    """
+    As :func:`idealized_surface_flux`, for time already given as
+    hours since midnight (float or array), e.g. from :func:`time_of_day_hours`.
+    """
+    if np.ndim(t) == 0:
+        if t >= daylength:
+            return 0.0  # night
+        return Fmax * max(0.0, math.sin(math.pi * t / daylength))
+
+    # Compute in place in a single array, to avoid further temporaries
+    t = np.asarray(t)
+    flux = t * (np.pi / daylength)
+    np.sin(flux, out=flux)
+    np.multiply(flux, Fmax, out=flux)
+    np.clip(flux, 0, None, out=flux)  # zero at night
+    np.copyto(flux, 0, where=t >= daylength)  # as for scalar time
     return flux
 
 
 # --------------------------------------------------------
-# 3. Irradiance at depth using exponential attenuation
+# 3. Gaussian solar-angle coefficient
+# --------------------------------------------------------
+def compute_solar_coeff(time, mean_lon, tau):
+    """
+    Gaussian weighting of the light based on a simplified solar angle.
+
+    Parameters
+    ----------
+    time : datetime, float or array-like
+        Time of day, as for :func:`time_of_day_hours`.
+    mean_lon : float
+        Mean longitude of the elements.
+    tau : float
+        Width parameter for Gaussian distribution.
+
+    Returns
+    -------
+    float or array
+        Solar coefficient, independent of depth. The value for a scalar
+        time is shared by all elements, and can be computed once per
+        time step.
+    """
+    return _solar_coeff_hours(time_of_day_hours(time), mean_lon, tau)
+
+
+def _solar_coeff_hours(t, mean_lon, tau):
+    # Solar angle using simplified hour-angle approximation
+    hour_angle_val = (t - 12) * 15 - mean_lon
+
+    if isinstance(hour_angle_val, (float, int)):
+        # Single value; the math module avoids the overhead of NumPy
+        solar_angle = math.radians(hour_angle_val)
+        return math.sqrt(tau / (2 * math.pi)) * \
+            math.exp(-tau * solar_angle**2 / 2)
+
+    solar_angle = np.deg2rad(hour_angle_val)
+
+    return np.sqrt(tau / (2 * np.pi)) * np.exp(-tau * solar_angle**2 / 2)
+
+
+# --------------------------------------------------------
+# 4. Exponential attenuation of surface light with depth
+# --------------------------------------------------------
+def irradiance_profile(solar_coeff, surface_flux, nu, z, k_water,
+                       depth_kernel=None):
+    """
+    Irradiance at depth for given solar coefficient and surface flux.
+
+    Parameters
+    ----------
+    solar_coeff : float or array-like
+        Output of :func:`compute_solar_coeff`.
+    surface_flux : float or array-like
+        Surface flux (W/m²), e.g. from :func:`idealized_surface_flux`.
+    nu : float
+        Biological/optical scaling parameter.
+    z : array-like
+        Depths (negative values).
+    k_water : float
+        Light attenuation coefficient.
+    depth_kernel : array-like, optional
+        Precomputed ``exp(k_water * z)``, which is then not recomputed
+        (and not modified).
+
+    Returns
+    -------
+    array-like
+        Irradiance at depth (µmol photon m⁻² s⁻¹). If `solar_coeff` or
+        `surface_flux` are arrays (one value per time), the shape is
+        ``time.shape + z.shape``.
+    """
+    # Convert W/m² → µmol photons m⁻² s⁻¹ (factor = 0.00836).
+    # All factors but the attenuation are independent of depth,
+    # so combine them before broadcasting over z.
+    surface_light = solar_coeff * surface_flux * nu * 0.00836
+
+    if depth_kernel is not None:
+        light = depth_kernel
+    else:
+        light = np.exp(k_water * np.asarray(z))
+    if np.ndim(surface_light) > 0:
+        # One row of depth profile per time
+        return np.multiply.outer(surface_light, light)
+    if depth_kernel is not None:
+        return surface_light * light
+    light *= surface_light
+    return light
+
+
+# --------------------------------------------------------
+# 5. Irradiance at depth using exponential attenuation
 # --------------------------------------------------------
 def irradiance_at_depth(time, lon, z, tau, nu, k_water,
                         daylength=24, Fmax=1000):
@@ -59,7 +178,9 @@ def irradiance_at_depth(time, lon, z, tau, nu, k_water,
 
     Parameters
     ----------
-    time : datetime or float
+    time : datetime, float or array-like
+        Time of day. If an array of times is given, the irradiance
+        is computed for every combination of time and depth.
     lon : array-like
         Longitudes (only mean is used here).
     z : array-like
@@ -78,28 +199,63 @@ def irradiance_at_depth(time, lon, z, tau, nu, k_water,
     Returns
     -------
     array-like
-        Irradiance at depth (µmol photon m⁻² s⁻¹).
+        Irradiance at depth (µmol photon m⁻² s⁻¹). For array `time`
+        the shape is ``time.shape + z.shape``.
     """
 
-    # Step 1: get surface flux (W/m²)
-    surface_flux = idealized_surface_flux(time, daylength, Fmax)
+    return _irradiance_hours(time_of_day_hours(time), lon, z, tau, nu,
+                             k_water, daylength, Fmax)
 
-    # Step 2: compute solar angle using simplified hour-angle approximation
-    mean_lon = np.mean(lon)
-    hour_angle_val = (time_of_day_hours(time) - 12) * 15 - mean_lon
-    solar_angle = np.deg2rad(hour_angle_val)
 
-    # Step 3: Gaussian weighting based on solar angle
-    solar_coeff = np.sqrt(tau / (2 * np.pi)) * np.exp(-tau * solar_angle**2 / 2)
+def _irradiance_hours(t, lon, z, tau, nu, k_water, daylength, Fmax,
+                      depth_kernel=None):
+    """As irradiance_at_depth, for time of day `t` in hours"""
+    surface_flux = idealized_surface_flux_hours(t, daylength, Fmax)
+    solar_coeff = _solar_coeff_hours(t, np.mean(lon), tau)
 
-    # Step 4: Convert W/m² → µmol photons m⁻² s⁻¹ (factor = 0.00836)
-    # And apply depth attenuation
-    light = (
-        solar_coeff
-        * surface_flux
-        * nu
-        * 0.00836
-        * np.exp(k_water * z)
-    )
+    return irradiance_profile(solar_coeff, surface_flux, nu, z, k_water,
+                              depth_kernel)
 
-    return light
+
+# --------------------------------------------------------
+# 6. Irradiance at fixed depths, for repeated evaluation
+# --------------------------------------------------------
+class IrradianceModel:
+    """
+    Irradiance model as :func:`irradiance_at_depth`, for fixed depths.
+
+    The depth attenuation ``exp(k_water * z)`` is computed once when the
+    model is created; each call then only scales it by the surface light
+    for the given time.
+
+    Parameters
+    ----------
+    z, tau, nu, k_water, daylength, Fmax
+        As for :func:`irradiance_at_depth`.
+
+    Examples
+    --------
+    >>> model = IrradianceModel(z=[-20., -10., 0.], tau=2, nu=0.5, k_water=0.1)
+    >>> model(12, lon=0).round(3)
+    array([0.319, 0.868, 2.358])
+    """
+
+    def __init__(self, z, tau, nu, k_water, daylength=24, Fmax=1000):
+        self.z = np.asarray(z)
+        self.tau = tau
+        self.nu = nu
+        self.k_water = k_water
+        self.daylength = daylength
+        self.Fmax = Fmax
+        self._depth_kernel = np.exp(k_water * self.z)
+
+    def __call__(self, time, lon):
+        """
+        Irradiance (µmol photon m⁻² s⁻¹) at the model depths.
+
+        For array `time` the shape is ``time.shape + z.shape``.
+        """
+        return _irradiance_hours(time_of_day_hours(time), lon, self.z,
+                                 self.tau, self.nu, self.k_water,
+                                 self.daylength, self.Fmax,
+                                 depth_kernel=self._depth_kernel)
@@ -15,11 +15,23 @@
 # Copyright 2015, Knut-Frode Dagestad, MET Norway
 
 import numpy as np
+from scipy.interpolate import interp1d
+from scipy.ndimage import map_coordinates
 import logging; logger = logging.getLogger(__name__)
 
 from opendrift.models.oceandrift import OceanDrift, Lagrangian3DArray
 from opendrift.config import CONFIG_LEVEL_ESSENTIAL, CONFIG_LEVEL_BASIC, CONFIG_LEVEL_ADVANCED
 
+try:
+    from opendrift import _phyto_ext
+except ImportError:
+    _phyto_ext = None
+
+# Constant factors of the terminal velocity equations
+_G = 9.81  # ms-2
+_G_OVER_18 = _G/18.0
+_D0_FACTOR = 9.0/(100*_G)
+
 
 # Defining the oil element properties
 class PelagicEgg(Lagrangian3DArray):
@@ -38,7 +50,10 @@ class PelagicEgg(Lagrangian3DArray):
                      'default': 1028.}),
         ('hatched', {'dtype': np.float32,
                      'units': '',
-                     'default': 0.})])
+                     'default': 0.}),
+        ('egg_number', {'dtype': np.float32,
+                        'units': '',
+                        'default': 1.})])
 
 
 class PelagicEggDrift(OceanDrift):
@@ -80,10 +95,18 @@ class PelagicEggDrift(OceanDrift):
         self._set_config_default('drift:vertical_mixing_at_surface', True)
         self._set_config_default('drift:vertical_advection_at_surface', True)
 
+        # float32 work arrays for update_terminal_velocity
+        self._scr = {k: np.empty(0, np.float32)
+                     for k in ('T0', 'S0', 'dr', 'my_w', 'd0', 'W2')}
+
+    def _scratch(self, n):
+        """Work arrays of length n, reallocated only when n changes."""
+        if self._scr['T0'].size != n:
+            self._scr = {k: np.empty(n, np.float32) for k in self._scr}
+        return self._scr
+
     def update_terminal_velocity(self, Tprofiles=None,
                                  Sprofiles=None, z_index=None):
-        g = 9.81  # ms-2
-
         eggsize = self.elements.diameter
         eggsalinity = self.elements.neutral_buoyancy_salinity
 
@@ -93,37 +116,81 @@ class PelagicEggDrift(OceanDrift):
                 z_index = interp1d(-self.environment_profiles['z'],
                                    z_i, bounds_error=False)
             zi = z_index(-self.elements.z)
-            upper = np.maximum(np.floor(zi).astype(np.uint8), 0)
-            lower = np.minimum(upper+1, Tprofiles.shape[0]-1)
-            weight_upper = 1 - (zi - upper)
+            # (level, element) coordinates for linear interpolation
+            coords = np.array([zi, np.arange(Tprofiles.shape[1])])
+
+        scr = self._scratch(len(self.elements.z))
+        T0, S0, dr, my_w, d0, W2 = (scr[k] for k in
+                                    ('T0', 'S0', 'dr', 'my_w', 'd0', 'W2'))
 
         if Tprofiles is None:
-            T0 = self.environment.sea_water_temperature
+            T0[:] = self.environment.sea_water_temperature
         else:
-            T0 = Tprofiles[upper, range(Tprofiles.shape[1])] * weight_upper + \
-                 Tprofiles[lower, range(Tprofiles.shape[1])] * (1-weight_upper)
+            map_coordinates(np.asarray(Tprofiles), coords, output=T0,
+                            order=1, mode='nearest')
         if Sprofiles is None:
-            S0 = self.environment.sea_water_salinity
+            S0[:] = self.environment.sea_water_salinity
         else:
-            S0 = Sprofiles[upper, range(Sprofiles.shape[1])] * weight_upper + \
-                 Sprofiles[lower, range(Sprofiles.shape[1])] * (1-weight_upper)
+            map_coordinates(np.asarray(Sprofiles), coords, output=S0,
+                            order=1, mode='nearest')
 
         DENSw = self.sea_water_density(T=T0, S=S0)
         DENSegg = self.sea_water_density(T=T0, S=eggsalinity)
-        dr = DENSw - DENSegg
+        np.subtract(DENSw, DENSegg, out=dr)
+
+        W = np.empty_like(T0)
+
+        # my_w = 0.001*(1.7915 - 0.0538*T0 + 0.007*T0*T0 - 0.0023*S0)
+        np.multiply(T0, 0.007, out=my_w)
+        my_w -= 0.0538
+        my_w *= T0
+        my_w += 1.7915
+        np.multiply(S0, 0.0023, out=W)
+        my_w -= W
+        my_w *= 0.001
+
+        # W = (1.0/my_w)*(1.0/18.0)*g*(eggsize**2) * dr
+        np.square(eggsize, out=W)
+        W *= dr
+        W /= my_w
+        W *= _G_OVER_18
+
+        # Reynolds number, W2 is used as work array until needed below
+        np.multiply(W, 1000, out=W2)
+        W2 *= eggsize
+        W2 /= my_w
+        highRe = W2 > 0.5
+
+        # Empirical terminal velocity where Re > 0.5, skipped if none are
+        if highRe.any():
+            # my_w = 0.01854 * np.exp(-0.02783 * T0)
+            np.multiply(T0, -0.02783, out=my_w)
+            np.exp(my_w, out=my_w)
+            my_w *= 0.01854
+
+            # d0 = (eggsize*100) - 0.4*(9.0*my_w**2/(100*g)*DENSw/dr)**(1.0/3.0)
+            np.square(my_w, out=d0)
+            d0 *= _D0_FACTOR
+            d0 *= DENSw
+            d0 /= dr
+            np.cbrt(d0, out=d0)
+            d0 *= -0.4
+            d0 += eggsize*100
+
+            # W2 = 19.0*d0*(0.001*dr)**(2.0/3.0)*(my_w*0.001*DENSw)**(-1.0/3.0)/100
+            # Fractional powers as cube roots, which are much cheaper
+            np.multiply(dr, 0.001, out=W2)
+            np.cbrt(W2, out=W2)
+            np.square(W2, out=W2)
+            W2 *= d0
+            my_w *= 0.001
+            my_w *= DENSw
+            np.cbrt(my_w, out=my_w)
+            W2 /= my_w
+            W2 *= 0.19  # 19.0, and cm/s -> m/s
+
+            np.copyto(W, W2, where=highRe)
 
-        my_w = 0.001*(1.7915 - 0.0538*T0 + 0.007*T0*T0 - 0.0023*S0)
-        W = (1.0/my_w)*(1.0/18.0)*g*(eggsize**2) * dr
-
-        highRe = np.where(W*1000*eggsize/my_w > 0.5)
-
-        my_w = 0.01854 * np.exp(-0.02783 * T0)
-        d0 = (eggsize*100) - 0.4 * (9.0 * my_w**2 /
-                                   (100 * g) * DENSw / dr)**(1.0/3.0)
-        W2 = 19.0*d0*(0.001*dr)**(2.0/3.0)*(my_w*0.001*DENSw)**(-1.0/3.0)
-        W2 = W2/100.
-
-        W[highRe] = W2[highRe]
         self.elements.terminal_velocity = W
 
     # ============================================================
@@ -141,13 +208,22 @@ class PelagicEggDrift(OceanDrift):
             Carrying capacity (maximum number of eggs).
         """
 
-        N = self.elements.
-        dNdt = r * N * (1 - N / K)
-        N_new = N + dNdt * self.dt_seconds
-
-        self.elements.number = N_new
-
-
+        N = self.elements.egg_number
+        dt = self.time_step.total_seconds()
+
+        if (_phyto_ext is not None and N.flags.c_contiguous and
+                N.dtype in (np.float32, np.float64)):
+            step = (_phyto_ext.logistic_step_f4 if N.dtype == np.float32
+                    else _phyto_ext.logistic_step_f8)
+            step(N, float(r), float(K), dt)
+            return
+
+        # N += r*dt*N*(1 - N/K), updated in place with a single temporary
+        dN = N * (1.0/K)
+        np.subtract(1.0, dN, out=dN)
+        dN *= N
+        dN *= r*dt
+        N += dN
 
     def update(self):
         """Update positions and properties of buoyant particles."""
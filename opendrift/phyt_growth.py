@@ -1,5 +1,86 @@
+import importlib.util
+import math
+import numbers
 import numpy as np
 
+try:
+    from opendrift import _phyto_ext
+except ImportError:
+    _phyto_ext = None
+
+# numba is slow to import, so opendrift._numba is only imported when
+# a compiled kernel is first needed
+_HAVE_NUMBA = importlib.util.find_spec('numba') is not None
+
+try:
+    import cupy as cp
+except ImportError:
+    cp = None
+
+if cp is not None:
+    # Whole growth equation as one fused GPU kernel, for cupy arrays
+    _phyt_growth_kernel = cp.ElementwiseKernel(
+        'T P, T I, T N, T Ph, T Fe, T Si, T temp, T mu_max, T alpha, '
+        'T K_N, T K_Ph, T K_Fe, T K_Si, T kT, T T_ref, T mortality',
+        'T dPdt',
+        '''
+        T mu_I = -expm1(-alpha * I);
+        T mu_nut = nan_min(nan_min(N / (K_N + N), Ph / (K_Ph + Ph)),
+                           nan_min(Fe / (K_Fe + Fe), Si / (K_Si + Si)));
+        T mu_T = exp(kT * (temp - T_ref));
+        dPdt = (mu_max * mu_I * mu_nut * mu_T - mortality) * P;
+        ''',
+        'phyt_growth',
+        # min() is fmin(), which ignores NaN; propagate it as np.minimum
+        preamble='''
+        template <typename U>
+        __device__ U nan_min(U a, U b) { return (a < b || a != a) ? a : b; }
+        ''')
+
+
+def _all_scalar(*args):
+    """True if all arguments are real numbers rather than arrays."""
+    return all(isinstance(a, numbers.Real) for a in args)
+
+
+def _nan_min(*values):
+    """Minimum of real numbers, NaN if any of them is NaN (as np.minimum)."""
+    if any(math.isnan(v) for v in values):
+        return math.nan
+    return min(values)
+
+
+def _numba_kernel(name):
+    """Kernel `name` of opendrift._numba, or None if numba is not installed."""
+    if not _HAVE_NUMBA:
+        return None
+    from opendrift import _numba
+    return getattr(_numba, name)
+
+
+def _phyt_growth_compiled():
+    """Compiled phyt_growth kernel, preferring the ahead-of-time extension."""
+    if _phyto_ext is not None:
+        return _phyto_ext.phyt_growth
+    return _numba_kernel('phyt_growth_core')
+
+
+def _kernel_inputs(*arrays):
+    """Inputs as 1D views for the compiled kernels, or None.
+
+    The kernels are only used when all inputs already are float64 arrays
+    of the same shape, since expanding scalars or converting dtypes would
+    cost more memory traffic than the kernel saves. Returns the common
+    shape together with the 1D views.
+    """
+    shape = np.shape(arrays[0])
+    if not all(isinstance(a, np.ndarray) and a.dtype == np.float64 and
+               a.shape == shape and (a.ndim == 1 or a.flags.c_contiguous)
+               for a in arrays):
+        return None
+    return shape, [a.reshape(-1) for a in arrays]
+
+
 def phyt_growth(
     P,
     I,
@@ -33,12 +114,49 @@ def phyt_growth(
         Temperature (°C)
     K_N, K_P, K_Fe : float
         Half-saturation constants
+
+    Float64 array inputs of equal shape are evaluated with a compiled kernel
+    if the ahead-of-time extension has been built (see
+    :mod:`opendrift._phyto_aot`) or numba is installed, otherwise with NumPy.
+    If P is a cupy array, growth is computed on the GPU.
+    Scalar inputs are evaluated with the math module, avoiding the
+    overhead of NumPy for single values.
     """
 
+    # Q10 ** ((T - T_ref)/10), written as an exponential
+    kT = (math.log(Q10) if np.ndim(Q10) == 0 else np.log(Q10)) * 0.1
+
+    params = (mu_max, alpha, K_N, K_Ph, K_Fe, K_Si, Q10, T_ref, mortality)
+    if _all_scalar(P, I, N, Ph, Fe, Si, T, *params):
+        mu_I = -math.expm1(-alpha * I)
+        mu_nut = _nan_min(N / (K_N + N), Ph / (K_Ph + Ph),
+                          Fe / (K_Fe + Fe), Si / (K_Si + Si))
+        mu_T = math.exp(kT * (T - T_ref))
+        return (mu_max * mu_I * mu_nut * mu_T - mortality) * P
+
+    if cp is not None and isinstance(P, cp.ndarray):
+        arrays = [cp.asarray(a, dtype=P.dtype) for a in (P, I, N, Ph, Fe, Si, T)]
+        # Array parameters (e.g. one value per element) are moved to the GPU
+        gpu_params = [cp.asarray(p, dtype=P.dtype) if np.ndim(p) else p
+                      for p in (mu_max, alpha, K_N, K_Ph, K_Fe, K_Si, kT,
+                                T_ref, mortality)]
+        return _phyt_growth_kernel(*arrays, *gpu_params)
+
+    # The compiled kernels take arrays of inputs, but scalar parameters
+    inputs = _kernel_inputs(P, I, N, Ph, Fe, Si, T)
+    kernel = (_phyt_growth_compiled() if inputs is not None and
+              not any(np.ndim(p) for p in params) else None)
+    if kernel is not None:
+        shape, arrays = inputs
+        dPdt = kernel(
+            *arrays, float(mu_max), float(alpha), float(K_N), float(K_Ph),
+            float(K_Fe), float(K_Si), kT, float(T_ref), float(mortality))
+        return dPdt.reshape(shape)
+
     # --------------------
     # Light limitation
     # --------------------
-    mu_I = 1.0 - np.exp(-alpha * I)
+    mu_I = -np.expm1(-alpha * I)
 
     # --------------------
     # Multi-nutrient limitation (Liebig minimum)
@@ -49,12 +167,12 @@ def phyt_growth(
     lim_Si = Si / (K_Si + Si)
 
 
-    mu_nut = np.minimum.reduce([lim_N, lim_Ph, lim_Fe,lim_Si])
+    mu_nut = np.minimum(np.minimum(lim_N, lim_Ph), np.minimum(lim_Fe, lim_Si))
 
     # --------------------
     # Temperature dependence
     # --------------------
-    mu_T = Q10 ** ((T - T_ref) / 10.0)
+    mu_T = np.exp(kT * (T - T_ref))
 
     # --------------------
     # Combined specific growth rate
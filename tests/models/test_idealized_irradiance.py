@@ -0,0 +1,78 @@
+from datetime import datetime
+
+import numpy as np
+
+from opendrift import idealized_irradiance as ii
+
+
+def test_time_of_day_hours():
+    assert ii.time_of_day_hours(datetime(2020, 5, 1, 6, 30)) == 6.5
+    assert ii.time_of_day_hours(13) == 13.0
+    times = np.array(['2020-05-01T06:30', '2020-05-02T18:00'],
+                     dtype='datetime64[m]')
+    np.testing.assert_allclose(ii.time_of_day_hours(times), [6.5, 18])
+    np.testing.assert_allclose(
+        ii.time_of_day_hours([datetime(2020, 5, 1, 3), datetime(2020, 5, 1, 9)]),
+        [3, 9])
+
+
+def test_irradiance_at_depth_time_array():
+    z = np.linspace(-50, 0, 11)
+    lon = [4, 5, 6]
+    hours = np.array([6., 9., 12., 15.])
+    light = ii.irradiance_at_depth(hours, lon, z, tau=2, nu=0.5, k_water=0.1)
+    assert light.shape == (4, 11)
+    for i, h in enumerate(hours):
+        np.testing.assert_allclose(
+            light[i],
+            ii.irradiance_at_depth(h, lon, z, tau=2, nu=0.5, k_water=0.1))
+
+    # Scalar times are not rounded
+    h = 5.123456789
+    np.testing.assert_allclose(
+        ii.irradiance_at_depth(h, lon, z, tau=2, nu=0.5, k_water=0.1),
+        ii.irradiance_at_depth([h], lon, z, tau=2, nu=0.5, k_water=0.1)[0],
+        rtol=1e-14)
+
+
+def test_idealized_surface_flux():
+    hours = np.array([0., 6., 12., 18., 23.])
+    flux = ii.idealized_surface_flux(hours, daylength=12, Fmax=1000)
+    np.testing.assert_allclose(flux, [0, 1000, 0, 0, 0], atol=1e-9)
+    for h, f in zip(hours, flux):
+        assert np.isclose(ii.idealized_surface_flux(h, daylength=12), f)
+
+    # No light after the end of the light period, also for short days
+    hours = np.array([3., 13.])
+    flux = ii.idealized_surface_flux(hours, daylength=6)
+    np.testing.assert_allclose(flux, [1000, 0], atol=1e-9)
+    assert ii.idealized_surface_flux(13., daylength=6) == 0
+    np.testing.assert_allclose(
+        ii.idealized_surface_flux_hours([3, 13], daylength=6), [1000, 0],
+        atol=1e-9)
+
+
+def test_irradiance_at_depth():
+    z = np.array([-30., -10., 0.])
+    time = datetime(2020, 6, 1, 10, 30)
+    light = ii.irradiance_at_depth(time, [4, 6], z, tau=2, nu=0.5, k_water=0.1)
+    np.testing.assert_allclose(light, [0.09146286, 0.67582417, 1.83708056],
+                               rtol=1e-6)
+
+    solar_coeff = ii.compute_solar_coeff(time, 5, tau=2)
+    assert solar_coeff == ii.compute_solar_coeff(10.5, 5., tau=2)
+    surface_flux = ii.idealized_surface_flux(time)
+    np.testing.assert_allclose(
+        ii.irradiance_profile(solar_coeff, surface_flux, 0.5, z, 0.1), light)
+
+
+def test_irradiance_model():
+    z = np.linspace(-50, 0, 11)
+    lon = [4, 5, 6]
+    model = ii.IrradianceModel(z, tau=2, nu=0.5, k_water=0.1)
+    for time in (datetime(2020, 6, 1, 10, 30), 15., np.array([6., 9., 12.])):
+        np.testing.assert_allclose(
+            model(time, lon),
+            ii.irradiance_at_depth(time, lon, z, tau=2, nu=0.5, k_water=0.1))
+    # The precomputed depth attenuation is not modified by the calls
+    np.testing.assert_array_equal(model._depth_kernel, np.exp(0.1*z))
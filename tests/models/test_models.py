@@ -32,6 +32,7 @@ from opendrift.models.openoil import OpenOil
 from opendrift.models.windblow import WindBlow
 from opendrift.models.shipdrift import ShipDrift
 from opendrift.models.larvalfish import LarvalFish
+from opendrift.models.pelagicegg2 import PelagicEggDrift
 
 import opendrift
 print(opendrift.versions())
@@ -154,5 +155,63 @@ class TestModels(unittest.TestCase):
         o = LarvalFish()
         # Tests to be added
 
+    def test_pelagicegg_logistic_growth(self):
+        o = PelagicEggDrift(loglevel=50)
+        o.set_config('general:use_auto_landmask', False)
+        o.set_config('environment:constant:land_binary_mask', 0)
+        o.seed_elements(lon=4, lat=60, z=-10, number=3, egg_number=100,
+                        time=datetime.now())
+        o.run(steps=4, time_step=3600)
+        self.assertEqual(o.num_elements_total(), 3)
+        N = 100.
+        for i in range(4):
+            N = N + 0.0005*3600*N*(1 - N/5000)
+        np.testing.assert_allclose(o.elements.egg_number, N, rtol=1e-5)
+
+    def test_pelagicegg_terminal_velocity(self):
+        def reference(T0, S0, eggsize, eggsalinity):
+            g = 9.81
+            DENSw = PelagicEggDrift.sea_water_density(T=T0, S=S0)
+            DENSegg = PelagicEggDrift.sea_water_density(T=T0, S=eggsalinity)
+            dr = DENSw - DENSegg
+            my_w = 0.001*(1.7915 - 0.0538*T0 + 0.007*T0*T0 - 0.0023*S0)
+            W = (1.0/my_w)*(1.0/18.0)*g*(eggsize**2) * dr
+            highRe = np.where(W*1000*eggsize/my_w > 0.5)
+            my_w = 0.01854 * np.exp(-0.02783 * T0)
+            d0 = (eggsize*100) - 0.4 * (9.0 * my_w**2 /
+                                       (100 * g) * DENSw / dr)**(1.0/3.0)
+            W2 = 19.0*d0*(0.001*dr)**(2.0/3.0)*(my_w*0.001*DENSw)**(-1.0/3.0)
+            W2 = W2/100.
+            W[highRe] = W2[highRe]
+            return W
+
+        diameter = np.array([0.001, 0.0014, 0.002, 0.004])
+        salinity = np.array([31., 31.25, 30., 25.])
+        o = PelagicEggDrift(loglevel=50)
+        o.set_config('general:use_auto_landmask', False)
+        o.set_config('environment:constant:land_binary_mask', 0)
+        o.set_config('environment:constant:sea_water_temperature', 8)
+        o.set_config('environment:constant:sea_water_salinity', 34)
+        o.set_config('drift:vertical_mixing', False)
+        o.seed_elements(lon=4, lat=60, z=[-5, -12, -20, -33], number=4,
+                        diameter=diameter, neutral_buoyancy_salinity=salinity,
+                        time=datetime.now())
+        o.run(steps=1)
+        W = reference(8., 34., diameter, salinity)
+        self.assertTrue((W*1000*diameter/0.0014 > 0.5).any())
+        np.testing.assert_allclose(o.elements.terminal_velocity, W, rtol=1e-4)
+
+        # Interpolation from vertical profiles
+        from scipy.interpolate import interp1d
+        z = np.array([0., 10., 25., 50.])
+        Tprofiles = np.repeat([[12.], [10.], [7.], [5.]], 4, axis=1)
+        Sprofiles = np.repeat([[32.], [33.], [34.], [35.]], 4, axis=1)
+        z_index = interp1d(z, range(len(z)), bounds_error=False)
+        o.update_terminal_velocity(Tprofiles, Sprofiles, z_index)
+        T0 = np.interp(-o.elements.z, z, Tprofiles[:, 0])
+        S0 = np.interp(-o.elements.z, z, Sprofiles[:, 0])
+        W = reference(T0, S0, diameter, salinity)
+        np.testing.assert_allclose(o.elements.terminal_velocity, W, rtol=1e-4)
+
 if __name__ == '__main__':
     unittest.main()
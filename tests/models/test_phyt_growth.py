@@ -0,0 +1,138 @@
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from opendrift import phyt_growth as pg
+
+
+@pytest.fixture
+def inputs():
+    rng = np.random.default_rng(1)
+    n = 50
+    return dict(P=rng.uniform(0.1, 2, n),
+                I=rng.uniform(0, 200, n),
+                N=rng.uniform(0, 2, n),
+                Ph=rng.uniform(0, 0.1, n),
+                Fe=rng.uniform(0, 0.005, n),
+                Si=rng.uniform(0, 0.005, n),
+                T=rng.uniform(15, 30, n))
+
+
+# Missing (NaN) nutrient values must give NaN growth on every code path
+NAN_ARGS = dict(P=np.ones(3), I=80, N=np.array([np.nan, 1.2, 1.2]),
+                Ph=np.array([0.05, np.nan, 0.05]), Fe=0.002, Si=0.002, T=27)
+NAN_EXPECTED = [np.nan, np.nan, 0.5183012792]
+
+
+def test_phyt_growth_scalar():
+    dPdt = pg.phyt_growth(1.0, 80, 1.2, 0.05, 0.002, 0.002, 27)
+    assert np.isclose(dPdt, 0.5183012792, rtol=1e-6)
+
+
+def test_phyt_growth_array_matches_scalar(inputs):
+    dPdt = pg.phyt_growth(**inputs)
+    assert dPdt.shape == inputs['P'].shape
+    for i in range(0, 50, 7):
+        expected = pg.phyt_growth(**{k: float(v[i]) for k, v in inputs.items()})
+        assert np.isclose(dPdt[i], expected, rtol=1e-6)
+
+
+def test_phyt_growth_array_parameter():
+    dPdt = pg.phyt_growth(np.ones(3), 80, 1.2, 0.05, 0.002, 0.002, 27,
+                          mortality=np.array([0.05, 0.1, 0.2]))
+    np.testing.assert_allclose(dPdt, [0.5183012792, 0.4683012792,
+                                      0.3683012792], rtol=1e-6)
+
+
+def test_phyt_growth_array_Q10():
+    Q10 = np.array([1.5, 2., 3.])
+    dPdt = pg.phyt_growth(np.ones(3), 80, 1.2, 0.05, 0.002, 0.002, 30, Q10=Q10)
+    mu = (1 - np.exp(-0.03*80)) * 0.625 * Q10**0.3
+    np.testing.assert_allclose(dPdt, mu - 0.05, rtol=1e-6)
+
+
+def test_phyt_growth_nan():
+    np.testing.assert_allclose(pg.phyt_growth(**NAN_ARGS), NAN_EXPECTED,
+                               rtol=1e-6)
+
+
+def test_phyt_growth_plain_numpy(inputs, monkeypatch):
+    dPdt = pg.phyt_growth(**inputs)
+    monkeypatch.setattr(pg, '_phyto_ext', None)
+    monkeypatch.setattr(pg, '_HAVE_NUMBA', False)
+    np.testing.assert_allclose(pg.phyt_growth(**inputs), dPdt, rtol=1e-6)
+    np.testing.assert_allclose(pg.phyt_growth(**NAN_ARGS), NAN_EXPECTED,
+                               rtol=1e-6)
+
+
+def test_phyt_growth_kernel_only_for_full_arrays(inputs, monkeypatch):
+    def kernel():
+        raise AssertionError('compiled kernel used')
+    dPdt = pg.phyt_growth(inputs['P'], 80., 1.2, 0.05, 0.002, 0.002, 20.)
+    monkeypatch.setattr(pg, '_phyt_growth_compiled', kernel)
+    # Scalar or float32 inputs are not expanded to full float64 arrays
+    np.testing.assert_allclose(
+        pg.phyt_growth(inputs['P'], 80., 1.2, 0.05, 0.002, 0.002, 20.), dPdt)
+    np.testing.assert_allclose(
+        pg.phyt_growth(inputs['P'].astype(np.float32), *np.float32(
+            [80., 1.2, 0.05, 0.002, 0.002, 20.])), dPdt, rtol=1e-5)
+
+
+def test_phyt_growth_imports_numba_lazily():
+    code = 'import sys, opendrift.phyt_growth; assert "numba" not in sys.modules'
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+
+def test_phyt_growth_cupy(inputs):
+    cp = pytest.importorskip('cupy')
+    dPdt = pg.phyt_growth(**{k: cp.asarray(v) for k, v in inputs.items()})
+    assert isinstance(dPdt, cp.ndarray)
+    np.testing.assert_allclose(cp.asnumpy(dPdt), pg.phyt_growth(**inputs),
+                               rtol=1e-6)
+    dPdt = pg.phyt_growth(**{k: cp.asarray(v) for k, v in NAN_ARGS.items()})
+    np.testing.assert_allclose(cp.asnumpy(dPdt), NAN_EXPECTED, rtol=1e-6)
+    dPdt = pg.phyt_growth(cp.ones(3), 80, 1.2, 0.05, 0.002, 0.002, 27,
+                          Q10=np.full(3, 2.),
+                          mortality=np.array([0.05, 0.1, 0.2]))
+    np.testing.assert_allclose(cp.asnumpy(dPdt), [0.5183012792, 0.4683012792,
+                                                  0.3683012792], rtol=1e-6)
+
+
+def test_phyt_growth_scalar_nan():
+    for i in range(len(NAN_EXPECTED)):
+        args = {k: float(np.asarray(v).flat[i] if np.ndim(v) else v)
+                for k, v in NAN_ARGS.items()}
+        np.testing.assert_allclose(pg.phyt_growth(**args), NAN_EXPECTED[i],
+                                   rtol=1e-6)
+
+
+def test_phyt_growth_scalar_array_parameter():
+    dPdt = pg.phyt_growth(1.0, 80, 1.2, 0.05, 0.002, 0.002, 27,
+                          mortality=np.array([0.05, 0.1]))
+    np.testing.assert_allclose(dPdt, [0.5183012792, 0.4683012792], rtol=1e-6)
+
+
+def test_phyt_growth_scalar_matches_numpy():
+    args = (1.0, 80, 1.2, 0.05, 0.002, 0.002, 24.5)
+    dPdt = pg.phyt_growth(*args)
+    assert isinstance(dPdt, float)
+    assert np.isclose(dPdt, pg.phyt_growth(*map(np.asarray, args)), rtol=1e-12)
+
+
+def test_phyt_growth_aot_extension(monkeypatch):
+    ext = pytest.importorskip('opendrift._phyto_ext')
+    monkeypatch.setattr(pg, '_phyto_ext', ext)
+    np.testing.assert_allclose(pg.phyt_growth(**NAN_ARGS), NAN_EXPECTED,
+                               rtol=1e-6)
+
+
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+def test_logistic_step_aot_extension(dtype):
+    ext = pytest.importorskip('opendrift._phyto_ext')
+    N = np.array([1., 100., 4000.], dtype=dtype)
+    expected = N + 0.0005*3600*N*(1 - N/5000)
+    step = ext.logistic_step_f4 if dtype == np.float32 else ext.logistic_step_f8
+    step(N, 0.0005, 5000., 3600.)
+    np.testing.assert_allclose(N, expected, rtol=1e-6)